@@ -1,85 +1,204 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, g, abort
 from flask_sqlalchemy import SQLAlchemy
+from functools import lru_cache
+import queue
 import sqlite3
 import os
 from sqlalchemy import text
 
+DATABASE = 'linkedin_data.db'
+POOL_SIZE = 5
+PAGE_SIZE = 200
+
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///linkedin_data.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DATABASE}'
 db = SQLAlchemy(app)
 
 def get_db_connection():
-    conn = sqlite3.connect('linkedin_data.db')
+    # cached_statements keeps the per-table page/search statements prepared
+    # for the connection's whole pooled lifetime
+    conn = sqlite3.connect(DATABASE, check_same_thread=False,
+                           cached_statements=256)
     conn.row_factory = sqlite3.Row
+    # Keep long-lived connections cheap to read from and their page cache hot
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA cache_size=-200000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
     return conn
 
+# Small pool of long-lived connections so SQLite's page cache survives
+# across requests instead of being rebuilt by connect-per-request
+_pool = queue.Queue(maxsize=POOL_SIZE)
+
+@app.before_request
+def _acquire_db():
+    try:
+        g.db = _pool.get_nowait()
+    except queue.Empty:
+        g.db = get_db_connection()
+
+@app.teardown_request
+def _release_db(exc):
+    conn = g.pop('db', None)
+    if conn is not None:
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def _db_mtime():
+    """Cache key for the schema caches; changes whenever the DB is rewritten"""
+    try:
+        return os.path.getmtime(DATABASE)
+    except OSError:
+        return 0.0
+
+@lru_cache(maxsize=None)
+def _list_tables_cached(mtime):
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        # sqlite_% covers the engine's internal tables (sqlite_stat1 from
+        # ANALYZE, sqlite_sequence, ...); the FTS virtual tables and their
+        # shadow tables (X_fts, X_fts_data, ...) are an index, not data
+        cursor.execute("SELECT name FROM sqlite_master "
+                       "WHERE type='table' AND name NOT LIKE 'sqlite_%'")
+        return tuple(row[0] for row in cursor.fetchall()
+                     if not row[0].endswith('_fts') and '_fts_' not in row[0])
+    finally:
+        conn.close()
+
+@lru_cache(maxsize=None)
+def _fts_tables_cached(mtime):
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        return frozenset(row[0] for row in cursor.fetchall()
+                         if row[0].endswith('_fts'))
+    finally:
+        conn.close()
+
+@lru_cache(maxsize=None)
+def _columns_of_cached(table_name, mtime):
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f'PRAGMA table_info("{table_name}")')
+        return tuple(tuple(col) for col in cursor.fetchall())
+    finally:
+        conn.close()
+
+def _list_tables():
+    """Table names in the database, cached until the DB file changes"""
+    return _list_tables_cached(_db_mtime())
+
+def _columns_of(table_name):
+    """PRAGMA table_info rows for a table, cached until the DB file changes"""
+    return _columns_of_cached(table_name, _db_mtime())
+
+def _fts_tables():
+    """FTS index tables (hidden from _list_tables), cached until the DB
+    file changes; search uses these to pick the indexed lookup path"""
+    return _fts_tables_cached(_db_mtime())
+
+@lru_cache(maxsize=None)
+def _row_count_cached(table_name, mtime):
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
+        return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+def _row_count(table_name):
+    """Row count for a table, cached until the DB file changes"""
+    return _row_count_cached(table_name, _db_mtime())
+
 @app.route('/')
 def index():
-    # Get list of tables in the database
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = cursor.fetchall()
-    conn.close()
+    # Get list of tables in the database (cached)
+    tables = [(name,) for name in _list_tables()]
     return render_template('index.html', tables=tables)
 
 @app.route('/table/<table_name>')
 def view_table(table_name):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Get table info (columns)
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = cursor.fetchall()
-    
-    # Get all rows from the table
-    cursor.execute(f"SELECT * FROM {table_name}")
+    # Reject unknown table names before any SQL is built; the remaining
+    # f-string SQL is then constant per table, so sqlite3's statement
+    # cache can reuse the prepared statements
+    if table_name not in _list_tables():
+        abort(404)
+
+    cursor = g.db.cursor()
+
+    # Get table info (columns, cached)
+    columns = _columns_of(table_name)
+
+    # Fetch one page of rows instead of materializing the whole table
+    page = max(request.args.get('page', 1, type=int), 1)
+    total_rows = _row_count(table_name)
+    total_pages = max((total_rows + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    cursor.execute(f'SELECT * FROM "{table_name}" LIMIT ? OFFSET ?',
+                   (PAGE_SIZE, (page - 1) * PAGE_SIZE))
     rows = cursor.fetchall()
-    
-    conn.close()
-    return render_template('table.html', 
+
+    return render_template('table.html',
                          table_name=table_name,
                          columns=columns,
-                         rows=rows)
+                         rows=rows,
+                         page=page,
+                         total_pages=total_pages,
+                         total_rows=total_rows)
 
 @app.route('/search')
 def search():
-    query = request.args.get('q', '').lower()
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Get all tables
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = cursor.fetchall()
-    
+    query = request.args.get('q', '')
+    cursor = g.db.cursor()
+
+    # Get all data tables and their FTS indexes (cached); _list_tables
+    # already excludes internals and FTS shadow tables
+    table_names = set(_list_tables())
+    fts_tables = _fts_tables()
+
     results = []
-    for table in tables:
-        table_name = table[0]
-        cursor.execute(f"SELECT * FROM {table_name}")
-        rows = cursor.fetchall()
-        
-        # Get column names
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = cursor.fetchall()
-        
-        # Check each row for the search query
+    pattern = f'%{query}%'
+    for table_name in sorted(table_names):
+        rows = None
+        fts_name = f'{table_name}_fts'
+        if fts_name in fts_tables:
+            # Inverted-index lookup instead of a full scan
+            try:
+                match = '"' + query.replace('"', '""') + '"'
+                cursor.execute(
+                    f'SELECT t.* FROM "{table_name}" t '
+                    f'JOIN "{fts_name}" f ON t.rowid = f.rowid '
+                    f'WHERE "{fts_name}" MATCH ?',
+                    (match,))
+                rows = cursor.fetchall()
+            except sqlite3.OperationalError:
+                rows = None
+
+        if rows is None:
+            # Get column names (cached)
+            columns = _columns_of(table_name)
+            if not columns:
+                continue
+
+            # Let SQLite do the substring matching instead of scanning rows in Python
+            where = ' OR '.join(f'"{col[1]}" LIKE ? COLLATE NOCASE' for col in columns)
+            cursor.execute(f'SELECT * FROM "{table_name}" WHERE {where}',
+                           [pattern] * len(columns))
+            rows = cursor.fetchall()
+
         for row in rows:
-            found = False
-            for col in columns:
-                col_name = col[1]
-                value = row[col_name]
-                if value and query in str(value).lower():
-                    found = True
-                    break
-            
-            if found:
-                result = {
-                    'table': table_name,
-                    'row': dict(row)
-                }
-                results.append(result)
-    
-    conn.close()
+            results.append({
+                'table': table_name,
+                'row': dict(row)
+            })
+
     return render_template('search_results.html', results=results, query=query)
 
 @app.route('/relationships')
@@ -0,0 +1,49 @@
+import asyncio
+
+
+class BrowserPagePool:
+    """Bounded pool of pre-created pages in a shared browser context.
+
+    Opening a fresh context and page per profile pays the setup cost
+    (request routing, init scripts, renderer spin-up) on every URL. The
+    pool creates max_pages pages up front and hands them out via an
+    asyncio.Queue; acquire() blocks while every page is busy, so the
+    pool also bounds how many profiles are in flight at once.
+    """
+
+    def __init__(self, context, max_pages: int = 4):
+        self._context = context
+        self._max_pages = max_pages
+        self._queue = asyncio.Queue(maxsize=max_pages)
+        self._pages = []
+
+    async def start(self):
+        """Pre-create the pages; returns the pool for chaining"""
+        for _ in range(self._max_pages):
+            page = await self._context.new_page()
+            self._pages.append(page)
+            self._queue.put_nowait(page)
+        return self
+
+    async def acquire(self):
+        """Borrow a page, waiting until one is free"""
+        return await self._queue.get()
+
+    def release(self, page):
+        """Return a borrowed page to the pool"""
+        self._queue.put_nowait(page)
+
+    async def close(self):
+        """Close every page; safe to call more than once"""
+        pages, self._pages = self._pages, []
+        for page in pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
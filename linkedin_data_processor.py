@@ -1,248 +1,321 @@
+import csv
+import logging
 import os
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pyarrow is an optional accelerator
+    pa = None
 import pandas as pd
 from pathlib import Path
 import re
 
+logger = logging.getLogger(__name__)
+
+# Precompiled patterns for column-name normalization (hot on the schema path)
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9_]')
+_MULTI_UNDER = re.compile(r'_+')
+
+# Columns that clash with SQL keywords or our own conventions
+_SPECIAL_COLUMNS = {
+    'date': 'date_col',
+    'from': 'col_from',
+    'to': 'col_to',
+    'text': 'col_text',
+}
+
+# Normalized columns worth indexing: the email/sender/recipient keys the
+# relationships view joins and searches on ('from'/'to' after renaming)
+_INDEX_COLUMNS = {'col_from', 'col_to', 'sender', 'recipient'}
+
+@lru_cache(maxsize=None)
+def _sqlite_type_for_kind(kind):
+    """SQLite column type for a numpy dtype kind"""
+    if kind in ('i', 'u'):
+        return 'INTEGER'
+    if kind == 'f':
+        return 'REAL'
+    if kind == 'M':
+        return 'TIMESTAMP'
+    return 'TEXT'
+
 class LinkedInDataProcessor:
     def __init__(self, input_dir, db_path='linkedin_data.db'):
         self.input_dir = Path(input_dir)
         self.db_path = Path(db_path)
         self.connection = None
-        self.column_mapping = {}
-        self._seen_columns = set()
         
     def _infer_data_type(self, series):
         """Infer appropriate SQLite data type for a pandas series"""
-        dtype = series.dtype
-        if pd.api.types.is_integer_dtype(dtype):
-            return 'INTEGER'
-        elif pd.api.types.is_float_dtype(dtype):
-            return 'REAL'
-        elif pd.api.types.is_datetime64_any_dtype(dtype):
-            return 'TIMESTAMP'
-        else:
-            return 'TEXT'
+        return _sqlite_type_for_kind(series.dtype.kind)
 
     def _normalize_column_name(self, col_name):
         """Normalize column names by removing special characters and making them lowercase"""
-        # Remove special characters (except underscore)
-        normalized = re.sub(r'[^a-zA-Z0-9_]', '_', col_name)
-        # Remove leading/trailing underscores
-        normalized = normalized.strip('_')
-        # Replace multiple underscores with single underscore
-        normalized = re.sub(r'_+', '_', normalized)
-        # Make lowercase
-        normalized = normalized.lower()
-        
-        # Handle date columns specially
-        if normalized == 'date':
-            normalized = 'date_col'
-        elif normalized in ['from', 'to', 'text']:
-            normalized = f'col_{normalized}'
-        
-        # If the column name contains 'date' but isn't exactly 'date', keep it as is
-        if 'date' in normalized and normalized != 'date_col':
-            normalized = normalized
-        
-        # Print debug info for problematic columns
-        if normalized == 'text':
-            print(f"\nDebug info for column '{col_name}'")
-            print(f"Original: {col_name}")
-            print(f"Normalized: {normalized}")
-        
-        return normalized
+        normalized = _MULTI_UNDER.sub('_', _NON_ALNUM.sub('_', col_name)).strip('_').lower()
+        # Rename columns that clash with SQL keywords
+        return _SPECIAL_COLUMNS.get(normalized, normalized)
+
+    def _primary_key_for(self, df, table_name):
+        """Pick a natural primary-key column for a table, if one exists
+
+        A candidate only qualifies when its values are fully populated and
+        unique in this file; LinkedIn exports routinely leave e.g. Email
+        Address blank, and a PRIMARY KEY on such a column would reject
+        those rows at insert time.
+        """
+        for candidate in ('email_address', f"{table_name.replace(' ', '_')}_id"):
+            if (candidate in df.columns
+                    and df[candidate].notna().all()
+                    and df[candidate].is_unique):
+                return candidate
+        return None
 
     def _create_table(self, df, table_name):
         """Create table in SQLite database with appropriate data types"""
+        primary_key = self._primary_key_for(df, table_name)
         # Replace spaces with underscores in table name and quote it
         table_name = '"' + table_name.replace(' ', '_') + '"'
-        
-        # Create mapping of original to normalized column names
-        self.column_mapping = {}
+
+        # Columns are already normalized on the DataFrame; always quote them
+        # to avoid SQL syntax errors
         columns = []
         for col in df.columns:
-            normalized_col = self._normalize_column_name(col)
-            self.column_mapping[col] = normalized_col
             dtype = self._infer_data_type(df[col])
-            # Always quote column names to avoid SQL syntax errors
-            normalized_col = '"' + normalized_col + '"'
-            columns.append(f"{normalized_col} {dtype}")
-            
-            # Print debug info for problematic columns
-            if normalized_col.lower() == '"text"':
-                print(f"\nDebug info for column '{col}'")
-                print(f"Original: {col}")
-                print(f"Normalized: {normalized_col}")
-                print(f"Data type: {dtype}")
-        
-        # Print debug info for problematic tables
-        if table_name in [""""ads_clicked""", """"coach_messages""", """"education""", """"email_addresses""", 
-                          """"endorsement_given_info""", """"endorsement_received_info""", """"events""", 
-                          """"hashtag_follows""", """"learning""", """"learning_coach_messages""", 
-                          """"learning_role_play_messages""", """"logins""", """"messages"""]:
-            print(f"\nDebug info for {table_name}")
-            print("Original column names:", df.columns.tolist())
-            print("Normalized column names:", [self.column_mapping[col] for col in df.columns])
-            
-            # Get the actual column names from the database
-            cursor = self.connection.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            db_columns = cursor.fetchall()
-            print("Database column names:", [col[1] for col in db_columns])
-            
-            # Print detailed mapping
-            print("Detailed mapping:")
-            for orig_col, norm_col in self.column_mapping.items():
-                print(f"  {orig_col} -> {norm_col}")
-        
+            if primary_key is not None and dtype == 'TIMESTAMP':
+                # STRICT tables only accept INT/INTEGER/REAL/TEXT/BLOB/ANY
+                dtype = 'ANY'
+            columns.append(f'"{col}" {dtype}')
+
         columns_str = ', '.join(columns)
-        create_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_str})"
+        if primary_key is not None:
+            # Rows live in the primary-key B-tree itself; STRICT skips
+            # per-value type coercion on insert
+            create_query = (f'CREATE TABLE IF NOT EXISTS {table_name} '
+                            f'({columns_str}, PRIMARY KEY("{primary_key}")) '
+                            f'STRICT, WITHOUT ROWID')
+        else:
+            create_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_str})"
         
         cursor = self.connection.cursor()
         try:
             cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
             cursor.execute(create_query)
-            self.connection.commit()
         except sqlite3.Error as e:
-            print(f"Error creating table {table_name}: {str(e)}")
+            logger.error("Error creating table %s: %s", table_name, e)
             raise
+
+        # The schema just written, in order, for the insert path to reuse
+        return list(df.columns)
     
-    def _insert_data(self, df, table_name):
-        """Insert data into existing table"""
+    def _insert_data(self, df, table_name, db_column_names):
+        """Insert data into the table _create_table just wrote"""
         # Replace spaces with underscores in table name and quote it
         table_name = '"' + table_name.replace(' ', '_') + '"'
-        
-        # Get column names and values for the INSERT statement
-        normalized_cols = []
-        for col in df.columns:
-            # If column exists in mapping, use normalized name
-            if col in self.column_mapping:
-                normalized_cols.append(self.column_mapping[col])
-            else:
-                # If column wasn't in original mapping (e.g. new column added), normalize it
-                normalized_cols.append(self._normalize_column_name(col))
-        
-        # Get column names from database to ensure they match
-        cursor = self.connection.cursor()
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        db_columns = cursor.fetchall()
-        db_column_names = [col[1] for col in db_columns]
-        
-        # Print debug info for problematic tables
-        problematic_tables = [
-            "ads_clicked", "coach_messages", "education", "email_addresses",
-            "endorsement_given_info", "endorsement_received_info", "events",
-            "hashtag_follows", "learning", "learning_coach_messages",
-            "learning_role_play_messages", "logins", "messages"
-        ]
-        if table_name in problematic_tables:
-            print(f"\nDebug info for {table_name}")
-            print("Database column names:", db_column_names)
-            print("Column mapping:", self.column_mapping)
-        
-        # Create insert query with quoted column names
-        columns_str = ', '.join([f'"{col}"' for col in db_column_names])
+
+        columns_str = ', '.join(f'"{col}"' for col in db_column_names)
         placeholders = ', '.join(['?'] * len(db_column_names))
         insert_query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
-        
-        # Convert DataFrame to list of tuples and insert data
-        data = []
-        for _, row in df.iterrows():
-            row_data = []
-            for col in db_column_names:
-                # Get the original column name from our mapping
-                orig_col = next((k for k, v in self.column_mapping.items() if v == col), col)
-                value = row.get(orig_col)
-                row_data.append(value)
-            data.append(tuple(row_data))
-        
+
+        # sqlite3's adapter lookup is exact-type, so the Timestamp objects
+        # produced by datetime inference don't bind; serialize 'M'-kind
+        # columns to ISO strings, masking their nulls along with the rest
+        mask = df.notna()
+        for col in df.columns:
+            if df[col].dtype.kind == 'M':
+                df[col] = df[col].astype(str)
+        # Arrow-backed frames surface missing values as pd.NA, which sqlite3
+        # cannot bind; map every NA variant to None before materializing
+        df = df.astype(object).where(mask, None)
+        # tolist() on an object ndarray materializes the parameter rows in C,
+        # with no per-row Python loop or attribute access
+        data = df.to_numpy(dtype=object).tolist()
         try:
-            cursor.executemany(insert_query, data)
-            self.connection.commit()
+            self.connection.cursor().executemany(insert_query, data)
         except sqlite3.Error as e:
-            print(f"Error inserting data into {table_name}: {str(e)}")
-            print(f"Insert query: {insert_query}")
-            print(f"First row of data: {data[0] if data else 'No data'}")
+            logger.error("Error inserting data into %s: %s", table_name, e)
             raise
     
+    def _create_indexes(self, df, table_name):
+        """Index join/search columns so lookups don't scan the whole table"""
+        table_name = table_name.replace(' ', '_')
+        cursor = self.connection.cursor()
+        for col in df.columns:
+            if col in _INDEX_COLUMNS or 'email' in col:
+                try:
+                    cursor.execute(
+                        f'CREATE INDEX IF NOT EXISTS "idx_{table_name}_{col}" '
+                        f'ON "{table_name}"("{col}")'
+                    )
+                except sqlite3.Error as e:
+                    logger.warning("Could not index %s.%s: %s", table_name, col, e)
+
+    def _create_fts_index(self, df, table_name):
+        """Build an FTS5 shadow table over a freshly loaded table for fast search"""
+        # Replace spaces with underscores to match the content table name
+        table_name = table_name.replace(' ', '_')
+        fts_name = f'{table_name}_fts'
+        columns_str = ', '.join(f'"{col}"' for col in df.columns)
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f'DROP TABLE IF EXISTS "{fts_name}"')
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE "{fts_name}" USING fts5('
+                f"{columns_str}, content='{table_name}', tokenize='unicode61')"
+            )
+            # Populate the index from the content table
+            cursor.execute(f'INSERT INTO "{fts_name}"("{fts_name}") VALUES (\'rebuild\')')
+        except sqlite3.Error as e:
+            # FTS5 may be missing from the SQLite build; search falls back to LIKE
+            logger.warning("Could not build FTS index for %s: %s", table_name, e)
+
     def process_directory(self):
         """Process all CSV files in the directory and load them into SQLite"""
-        # Create database connection
-        self.connection = sqlite3.connect(self.db_path)
-        
+        # Create database connection; isolation_level=None disables the
+        # driver's implicit per-statement transactions so we control them
+        # cached_statements above the default 128 keeps every table's
+        # INSERT/CREATE statements prepared across the whole ingest
+        self.connection = sqlite3.connect(self.db_path, isolation_level=None,
+                                          cached_statements=256)
+        self._tune_connection()
+
         # Find all CSV files recursively
         csv_files = list(self.input_dir.rglob('*.csv'))
-        
-        for csv_file in csv_files:
-            try:
-                # Read CSV file with multiple parsing attempts
-                df = None
+
+        # One transaction (and one fsync) for the whole ingest
+        self.connection.execute("BEGIN IMMEDIATE")
+
+        # Parse on all cores; keep the SQLite writes single-threaded since
+        # SQLite serializes writers anyway
+        with ProcessPoolExecutor() as executor:
+            for csv_file, df in zip(csv_files, executor.map(parse_csv, csv_files)):
                 try:
-                    # Try standard CSV parsing
-                    df = pd.read_csv(csv_file, on_bad_lines='warn', encoding='utf-8')
-                    print(f"Successfully parsed {csv_file.name} with default settings")
-                except pd.errors.ParserError as e:
-                    print(f"Warning: Failed to parse {csv_file.name} with default settings: {str(e)}")
+                    if df is None:
+                        raise ValueError(f"Could not parse CSV file {csv_file.name}")
+
+                    # Drop any rows with missing values in the first column
+                    if len(df.columns) > 0:
+                        df = df.dropna(subset=[df.columns[0]])
+
+                    # Normalize column names on the DataFrame itself so the
+                    # schema and the insert path agree without any remapping
+                    df.columns = [self._normalize_column_name(col) for col in df.columns]
+
+                    table_name = csv_file.stem.lower()
+                    # Per-file savepoint inside the ingest-wide transaction:
+                    # a failed file rolls back to here instead of committing
+                    # whatever executemany managed before the error
+                    self.connection.execute("SAVEPOINT ingest_file")
                     try:
-                        # Try with different delimiter
-                        df = pd.read_csv(csv_file, delimiter=';', on_bad_lines='warn', encoding='utf-8')
-                        print(f"Successfully parsed {csv_file.name} with semicolon delimiter")
-                    except pd.errors.ParserError as e:
-                        print(f"Warning: Failed to parse {csv_file.name} with semicolon delimiter: {str(e)}")
-                        try:
-                            # Try with different quote handling
-                            df = pd.read_csv(csv_file, quotechar='"', on_bad_lines='warn', encoding='utf-8')
-                            print(f"Successfully parsed {csv_file.name} with quote handling")
-                        except pd.errors.ParserError as e:
-                            print(f"Warning: Failed to parse {csv_file.name} with quote handling: {str(e)}")
-                            try:
-                                # Try with different encoding
-                                df = pd.read_csv(csv_file, on_bad_lines='warn', encoding='latin1')
-                                print(f"Successfully parsed {csv_file.name} with latin1 encoding")
-                            except pd.errors.ParserError as e:
-                                print(f"Warning: Failed to parse {csv_file.name} with latin1 encoding: {str(e)}")
-                                try:
-                                    # Try with different quote handling and encoding
-                                    df = pd.read_csv(csv_file, quotechar='"', on_bad_lines='warn', encoding='latin1')
-                                    print(f"Successfully parsed {csv_file.name} with latin1 encoding and quote handling")
-                                except pd.errors.ParserError as e:
-                                    print(f"Warning: Failed to parse {csv_file.name} with latin1 encoding and quote handling: {str(e)}")
-                                    try:
-                                        df = pd.read_csv(csv_file, delimiter=';', on_bad_lines='warn', encoding='latin1')
-                                        print(f"Successfully parsed {csv_file.name} with semicolon delimiter and latin1 encoding")
-                                    except pd.errors.ParserError as e:
-                                        print(f"Warning: Failed to parse {csv_file.name} with semicolon delimiter and latin1 encoding: {str(e)}")
-                                        print(f"Warning: Could not parse {csv_file.name} using standard methods")
-                                        try:
-                                            with open(csv_file, 'r', encoding='utf-8') as f:
-                                                lines = f.readlines()
-                                            lines = [line.strip() for line in lines if line.strip()]
-                                            data = [re.split(r',(?=(?:[^"\']*"[^"\']*"[^"\']*"[^"]*$|[^"]*$))', line) for line in lines]
-                                            df = pd.DataFrame(data[1:], columns=data[0])
-                                            print(f"Successfully parsed {csv_file.name} using manual method")
-                                        except Exception as e:
-                                            print(f"Error reading {csv_file.name}: {str(e)}")
-                                            continue
-                if df is None:
-                    raise ValueError(f"Could not parse CSV file {csv_file.name}")
-                
-                # Drop any rows with missing values in the first column
-                if len(df.columns) > 0:
-                    df = df.dropna(subset=[df.columns[0]])
-                
-                table_name = csv_file.stem.lower()
-                self._create_table(df, table_name)
-                self._insert_data(df, table_name)
-                print(f"Successfully processed: {csv_file.name}")
-            except Exception as e:
-                print(f"Error processing {csv_file.name}: {str(e)}")
-                if isinstance(e, pd.errors.ParserError):
-                    print(f"  Details: {str(e)}")
-                continue
-        
+                        db_column_names = self._create_table(df, table_name)
+                        self._insert_data(df, table_name, db_column_names)
+                        self._create_indexes(df, table_name)
+                        # External-content FTS needs a rowid, which
+                        # WITHOUT ROWID tables don't have
+                        if self._primary_key_for(df, table_name) is None:
+                            self._create_fts_index(df, table_name)
+                    except Exception:
+                        self.connection.execute("ROLLBACK TO ingest_file")
+                        raise
+                    finally:
+                        self.connection.execute("RELEASE ingest_file")
+                    logger.info("Successfully processed: %s", csv_file.name)
+                except Exception as e:
+                    logger.error("Error processing %s: %s", csv_file.name, e)
+                    continue
+
+        self.connection.execute("COMMIT")
+
+        # Refresh planner statistics now that tables and indexes exist
+        self.connection.execute("ANALYZE")
         self.connection.close()
 
+    def _tune_connection(self):
+        """Tune SQLite for bulk ingest: WAL avoids the rollback journal,
+        synchronous=NORMAL skips the per-commit double fsync"""
+        cursor = self.connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-200000")
+        # Read pages through the OS page cache instead of read() syscalls
+        cursor.execute("PRAGMA mmap_size=268435456")
+
+def parse_csv(csv_file):
+    """Read one CSV file in a single pass.
+
+    Sniffs the dialect from the head of the file, then parses once with
+    pyarrow's multithreaded reader when it is installed (plain pandas
+    otherwise), retrying in latin1 when the file is not valid UTF-8.
+    Module-level so ProcessPoolExecutor workers can pickle it; returns a
+    DataFrame, or None when every attempt failed.
+    """
+    with open(csv_file, 'rb') as f:
+        sample = f.read(64 * 1024)
+    try:
+        dialect = csv.Sniffer().sniff(sample.decode('utf-8', 'replace'))
+        delimiter, quotechar = dialect.delimiter, dialect.quotechar
+    except csv.Error:
+        delimiter, quotechar = ',', '"'
+
+    for encoding in ('utf-8', 'latin1'):
+        if pa is not None:
+            try:
+                table = pa_csv.read_csv(
+                    csv_file,
+                    read_options=pa_csv.ReadOptions(encoding=encoding),
+                    parse_options=pa_csv.ParseOptions(delimiter=delimiter,
+                                                      quote_char=quotechar))
+                # Arrow doesn't raise on undecodable input; it silently types
+                # the affected columns as binary, which would land BLOBs in
+                # SQLite and break LIKE/FTS search. Treat a binary column as
+                # a wrong-encoding signal and retry with the next encoding.
+                if any(pa.types.is_binary(field.type) or
+                       pa.types.is_large_binary(field.type)
+                       for field in table.schema):
+                    logger.debug("%s is not valid %s (binary columns), retrying",
+                                 csv_file.name, encoding)
+                    continue
+                logger.debug("Parsed %s with pyarrow (%s)", csv_file.name, encoding)
+                # Arrow-backed dtypes keep string columns zero-copy
+                return table.to_pandas(types_mapper=pd.ArrowDtype)
+            except pa.ArrowInvalid as e:
+                logger.debug("Failed to parse %s with pyarrow (%s): %s",
+                             csv_file.name, encoding, e)
+        # pandas tolerates input Arrow rejects (on_bad_lines handles ragged
+        # lines), so it runs both when pyarrow is absent and as the fallback
+        # when Arrow gives up on a file
+        try:
+            df = pd.read_csv(csv_file, delimiter=delimiter, quotechar=quotechar,
+                             on_bad_lines='warn', encoding=encoding)
+            logger.debug("Parsed %s with pandas (%s)", csv_file.name, encoding)
+            return df
+        except (pd.errors.ParserError, UnicodeDecodeError) as e:
+            logger.debug("Failed to parse %s with pandas (%s): %s",
+                         csv_file.name, encoding, e)
+
+    logger.warning("Could not parse %s using standard methods", csv_file.name)
+    try:
+        # csv.reader is a linear C state machine and handles quoted commas,
+        # unlike the lookahead regex split this replaces
+        with open(csv_file, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            rows = [row for row in csv.reader(f, delimiter=delimiter, quotechar=quotechar) if row]
+        header = rows[0]
+        width = len(header)
+        # Pad short rows and truncate long ones so ragged lines degrade to
+        # partial data instead of failing the whole file
+        data = [row[:width] + [None] * (width - len(row)) for row in rows[1:]]
+        df = pd.DataFrame(data, columns=header)
+        logger.debug("Parsed %s using manual method", csv_file.name)
+        return df
+    except Exception as e:
+        logger.error("Error reading %s: %s", csv_file.name, e)
+        return None
+
 def main():
     import argparse
     
@@ -254,7 +327,9 @@ def main():
                        help='Path to SQLite database file (default: linkedin_data.db)')
     
     args = parser.parse_args()
-    
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+
     # Create and run processor
     processor = LinkedInDataProcessor(
         input_dir=args.input_dir,
@@ -1,49 +1,291 @@
-from linkedin_scraper import LinkedInScraper
-import argparse
+import asyncio
+import atexit
+import logging
+import os
+import signal
+import sys
+import types
+
+_USAGE = """\
+usage: scrape_linkedin.py [-h] [--credentials-source {env,args,interactive}]
+                          [--email EMAIL] [--password PASSWORD]
+                          [--db-path DB_PATH] [--limit LIMIT]
+                          [--concurrency CONCURRENCY]
+                          [--cdp-endpoint CDP_ENDPOINT]
+                          [--user-data-dir USER_DATA_DIR]
+
+LinkedIn Profile Scraper
+
+options:
+  -h, --help            show this help message and exit
+  --credentials-source {env,args,interactive}
+                        Source for LinkedIn credentials (default: env)
+  --email EMAIL         LinkedIn email (required with --credentials-source=args)
+  --password PASSWORD   LinkedIn password (required with --credentials-source=args)
+  --db-path DB_PATH     Path to SQLite database (default: linkedin_data.db)
+  --limit LIMIT         Limit number of profiles to scrape
+  --concurrency CONCURRENCY
+                        Number of profiles scraped in parallel
+                        (default: min(8, cpu count))
+  --cdp-endpoint CDP_ENDPOINT
+                        Attach to a running Chrome over CDP instead of
+                        launching (e.g. http://localhost:9222)
+  --user-data-dir USER_DATA_DIR
+                        Launch a persistent Chrome profile from this
+                        directory so the session survives between runs
+  --load-images         Disable resource/tracker blocking and load pages
+                        fully (useful when debugging selectors)
+  --shards SHARDS       Split the URL list across this many worker
+                        processes, each with its own browser and database
+                        shard, merged into the main database afterwards
+                        (default: 1)
+  --debug               Verbose scraper logging and full tracebacks on
+                        failure instead of a one-line error
+"""
+
+# Flag name -> (attribute, value coercion); a hand-rolled walk over
+# sys.argv keeps startup free of argparse's module import and parser
+# construction, which showed up in CLI startup profiles
+_FLAGS = {
+    '--credentials-source': ('credentials_source', str),
+    '--email': ('email', str),
+    '--password': ('password', str),
+    '--db-path': ('db_path', str),
+    '--limit': ('limit', int),
+    '--concurrency': ('concurrency', int),
+    '--cdp-endpoint': ('cdp_endpoint', str),
+    '--user-data-dir': ('user_data_dir', str),
+    '--shards': ('shards', int),
+}
+
+# Flags that take no value and just set their attribute to True
+_BOOL_FLAGS = {
+    '--load-images': 'load_images',
+    '--debug': 'debug',
+}
+
+def _error(message):
+    sys.stderr.write(f"error: {message}\n")
+    sys.exit(2)
+
+def parse_args(argv=None):
+    """Parse CLI arguments without argparse; mirrors its behavior for
+    the flags this script has always accepted"""
+    argv = sys.argv[1:] if argv is None else argv
+    args = types.SimpleNamespace(
+        credentials_source='env',
+        email=None,
+        password=None,
+        db_path='linkedin_data.db',
+        limit=None,
+        concurrency=min(8, os.cpu_count() or 4),
+        cdp_endpoint=None,
+        user_data_dir=None,
+        load_images=False,
+        shards=1,
+        debug=False,
+    )
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ('-h', '--help'):
+            sys.stdout.write(_USAGE)
+            sys.exit(0)
+        if arg in _BOOL_FLAGS:
+            setattr(args, _BOOL_FLAGS[arg], True)
+            i += 1
+            continue
+        name, _, inline_value = arg.partition('=')
+        if name not in _FLAGS:
+            _error(f"unrecognized argument: {arg}")
+        attr, coerce = _FLAGS[name]
+        if inline_value or '=' in arg:
+            value = inline_value
+        else:
+            i += 1
+            if i >= len(argv):
+                _error(f"argument {name}: expected one argument")
+            value = argv[i]
+        try:
+            setattr(args, attr, coerce(value))
+        except ValueError:
+            _error(f"argument {name}: invalid {coerce.__name__} value: {value!r}")
+        i += 1
+
+    if args.credentials_source not in ('env', 'args', 'interactive'):
+        _error("argument --credentials-source: invalid choice: "
+               f"{args.credentials_source!r} (choose from 'env', 'args', 'interactive')")
+    return args
+
+_PROFILES_DDL = ("CREATE TABLE IF NOT EXISTS profiles ("
+                 "url TEXT PRIMARY KEY, scraped_at TEXT, "
+                 "experience_json TEXT, education_json TEXT)")
+
+def _shard_db_path(db_path, shard_index):
+    return f"{db_path}.shard{shard_index}"
+
+def _pending_urls(db_path, limit):
+    """Distinct connection URLs not yet scraped, read from the main DB"""
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        query = ("SELECT DISTINCT linkedin_url FROM connections "
+                 "WHERE linkedin_url IS NOT NULL")
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        urls = [row[0] for row in conn.execute(query, params)]
+        try:
+            done = {row[0] for row in conn.execute("SELECT url FROM profiles")}
+        except sqlite3.OperationalError:
+            done = set()  # profiles table doesn't exist yet
+        return [url for url in urls if url and url not in done]
+    finally:
+        conn.close()
+
+def _run_shard(shard_args):
+    """Scrape one slice of URLs into a shard database (child process)"""
+    shard_index, urls, options = shard_args
+    from linkedin_scraper import LinkedInScraper
+    scraper = LinkedInScraper(
+        db_path=_shard_db_path(options['db_path'], shard_index),
+        credentials_source=options['credentials_source'],
+        email=options['email'],
+        password=options['password'],
+        concurrency=options['concurrency'],
+        load_images=options['load_images'],
+    )
+
+    async def _run():
+        async with scraper:
+            return await scraper.scrape_connections(urls=urls)
+
+    return len(asyncio.run(_run()))
+
+def _merge_shards(db_path, shard_paths):
+    """Fold every shard's profiles into the main database, then drop shards"""
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(_PROFILES_DDL)
+        for shard_path in shard_paths:
+            if not os.path.exists(shard_path):
+                continue
+            conn.execute("ATTACH DATABASE ? AS shard", (shard_path,))
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO profiles SELECT * FROM shard.profiles")
+                conn.commit()
+            except sqlite3.OperationalError:
+                pass  # shard scraped nothing, so it has no profiles table
+            conn.execute("DETACH DATABASE shard")
+    finally:
+        conn.close()
+    for shard_path in shard_paths:
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                os.remove(shard_path + suffix)
+            except OSError:
+                pass
+
+def _run_sharded(args):
+    """Fan the URL list out over N worker processes, one browser each"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    urls = _pending_urls(args.db_path, args.limit)
+    if not urls:
+        return 0
+    slices = [urls[i::args.shards] for i in range(args.shards)]
+    options = {
+        'db_path': args.db_path,
+        'credentials_source': args.credentials_source,
+        'email': args.email,
+        'password': args.password,
+        'concurrency': args.concurrency,
+        'load_images': args.load_images,
+    }
+    work = [(i, urls_slice, options)
+            for i, urls_slice in enumerate(slices) if urls_slice]
+    with ProcessPoolExecutor(max_workers=len(work)) as executor:
+        counts = list(executor.map(_run_shard, work))
+    _merge_shards(args.db_path, [_shard_db_path(args.db_path, i)
+                                 for i, _, _ in work])
+    return sum(counts)
 
 def main():
-    parser = argparse.ArgumentParser(description='LinkedIn Profile Scraper')
-    
-    # Credentials source
-    parser.add_argument('--credentials-source', choices=['env', 'args', 'interactive'],
-                        default='env',
-                        help='Source for LinkedIn credentials (default: env)')
-    
-    # Credentials for args source
-    parser.add_argument('--email', help='LinkedIn email (required with --credentials-source=args)')
-    parser.add_argument('--password', help='LinkedIn password (required with --credentials-source=args)')
-    
-    # Database path
-    parser.add_argument('--db-path', default='linkedin_data.db',
-                        help='Path to SQLite database (default: linkedin_data.db)')
-    
-    # Scraping options
-    parser.add_argument('--limit', type=int, help='Limit number of profiles to scrape')
-    
-    args = parser.parse_args()
-    
+    args = parse_args()
+
     # Validate credentials source and arguments
     if args.credentials_source == 'args' and (not args.email or not args.password):
-        parser.error("--email and --password are required with --credentials-source=args")
-    
+        _error("--email and --password are required with --credentials-source=args")
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO,
+                        format='%(levelname)s %(message)s')
+
+    if args.shards > 1:
+        scraped = _run_sharded(args)
+        print(f"Successfully scraped {scraped} profiles across {args.shards} shards")
+        return
+
+    # Imported after parse_args so --help and argument errors don't pay
+    # for pandas/sqlalchemy/playwright import time
+    from linkedin_scraper import LinkedInScraper
+
+    # Create scraper instance
+    scraper = LinkedInScraper(
+        db_path=args.db_path,
+        credentials_source=args.credentials_source,
+        email=args.email if args.email else None,
+        password=args.password if args.password else None,
+        concurrency=args.concurrency,
+        cdp_endpoint=args.cdp_endpoint,
+        user_data_dir=args.user_data_dir,
+        load_images=args.load_images,
+        debug=args.debug
+    )
+
+    def _cleanup():
+        # Best-effort shutdown from sync context; close() is idempotent,
+        # so the normal async-with exit having already run is fine, and
+        # any error here just means the browser process dies with us
+        try:
+            asyncio.run(scraper.close())
+        except Exception:
+            pass
+
+    def _on_sigint(signum, frame):
+        # Flush buffered profiles and close the browser before dying with
+        # the conventional interrupted exit code
+        scraper._flush()
+        _cleanup()
+        sys.exit(130)
+
+    # Belt and braces for paths that skip the try/finally below, e.g.
+    # sys.exit from deeper in the stack or an unraisable error
+    atexit.register(_cleanup)
+    signal.signal(signal.SIGINT, _on_sigint)
+
     try:
-        # Create scraper instance
-        scraper = LinkedInScraper(
-            db_path=args.db_path,
-            credentials_source=args.credentials_source,
-            email=args.email if args.email else None,
-            password=args.password if args.password else None
-        )
-        
-        # Scrape data
-        results = scraper.scrape_connections(limit=args.limit)
+        # Scrape data, shutting the browser down when done
+        async def _run():
+            async with scraper:
+                return await scraper.scrape_connections(limit=args.limit)
+
+        results = asyncio.run(_run())
         print(f"Successfully scraped {len(results)} profiles")
-        
+
     except Exception as e:
-        print(f"Error: {str(e)}")
-        if hasattr(e, 'args') and len(e.args) > 0:
-            print(f"Detailed error: {e.args[0]}")
-        raise
+        # A traceback is developer output; end users get one line on
+        # stderr and a conventional failure exit code
+        if args.debug:
+            raise
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(2)
+    finally:
+        _cleanup()
+        atexit.unregister(_cleanup)
 
 if __name__ == '__main__':
     main()